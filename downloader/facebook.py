@@ -1,9 +1,39 @@
 """Logged-in facebook session."""
+import json
+import os
+import tempfile
 import time
 import requests
 from typing import Optional
 
 
+USER_AGENT = ("Mozilla/5.0 (X11; Linux i686; rv:39.0) Gecko/20100101 "
+              "Firefox/39.0")
+# Cookies that facebook sets only after a successful login.
+LOGIN_COOKIES = ("c_user", "xs")
+# Fields saved for each cookie by `FacebookSession.save_cookies`.
+COOKIE_FIELDS = ("name", "value", "domain", "path", "expires", "secure")
+
+
+class LoginError(Exception):
+  """Raised when logging in to facebook fails."""
+  pass
+
+
+def _is_valid_cookie(cookie) -> bool:
+  """Checks if `cookie` is an entry written by `FacebookSession.save_cookies`."""
+  if not isinstance(cookie, dict) or set(cookie) != set(COOKIE_FIELDS):
+    return False
+  if not all(isinstance(cookie[field], str)
+             for field in ("name", "value", "domain", "path")):
+    return False
+  expires = cookie["expires"]
+  if expires is not None and (isinstance(expires, bool) or
+                              not isinstance(expires, (int, float))):
+    return False
+  return isinstance(cookie["secure"], bool)
+
+
 class FacebookSession:
   """Requests logged-in facebook session."""
 
@@ -14,18 +44,155 @@ class FacebookSession:
       self.session = requests.session()
     else:
       self.session = session
+    self.session.headers.update({"User-Agent": USER_AGENT})
 
   def login(self, email: str, password: str):
-    """Login to facebook using an email and password."""
-    self.session.headers.update(
-        {'User-Agent': 'Mozilla/5.0 (X11; Linux i686; rv:39.0) Gecko/20100101 Firefox/39.0'})
+    """Login to facebook using an email and password.
 
+    Raises:
+      LoginError: If facebook did not set the login cookies.
+    """
     # Navigate to Facebook's homepage to load Facebook's cookies.
     self.session.get(self.base_url)
     # Attempt to login to Facebook
     self.session.post('{}/login.php'.format(self.base_url),
                       data={'email': email, 'pass': password},
                       allow_redirects=False)
+    if not self.has_login_cookies(self.session.cookies):
+      raise LoginError("Failed to log in to facebook using {}.".format(email))
+
+  @staticmethod
+  def has_login_cookies(cookies: requests.cookies.RequestsCookieJar) -> bool:
+    """Checks if `cookies` contain unexpired facebook login cookies.
+
+    This does not send any request, so it cannot detect sessions that were
+    revoked on facebook's side. See `check_login` for that.
+    """
+    now = time.time()
+    return all(any(cookie.name == name and not cookie.is_expired(now)
+                   for cookie in cookies)
+               for name in LOGIN_COOKIES)
+
+  def check_login(self) -> bool:
+    """Checks if the session is logged in to facebook.
+
+    Sends a single request to the homepage without following redirects.
+    Logged out or blocked sessions are redirected to the login or checkpoint
+    pages and facebook also deletes the login cookies in that case.
+    """
+    if not self.has_login_cookies(self.session.cookies):
+      return False
+    try:
+      page = self.session.get(self.base_url, allow_redirects=False)
+    except requests.RequestException:
+      return False
+    location = page.headers.get("Location", "")
+    if "login" in location or "checkpoint" in location:
+      return False
+    return (page.status_code < 400 and
+            self.has_login_cookies(self.session.cookies))
+
+  def save_cookies(self, file_dir: str):
+    """Saves the session cookies to a JSON file readable only by the owner.
+
+    The cookies are first written to a temporary file which then replaces
+    `file_dir`, so that an interrupted save never leaves a partial file.
+
+    Failing to save only prints a warning, since the cookies are not required
+    for the current run.
+
+    Args:
+      file_dir: Path of the `json` file to save the cookies.
+    """
+    cookies = [{field: getattr(cookie, field) for field in COOKIE_FIELDS}
+               for cookie in self.session.cookies]
+    try:
+      # `mkstemp` creates the file with 0600 permissions.
+      fd, temp_dir = tempfile.mkstemp(dir=os.path.dirname(file_dir) or ".")
+      try:
+        with os.fdopen(fd, "w") as file:
+          json.dump(cookies, file)
+        os.replace(temp_dir, file_dir)
+      except BaseException:
+        os.remove(temp_dir)
+        raise
+    except OSError as error:
+      print("WARNING: Failed to save cookies to {}: {}".format(file_dir, error))
+
+  @staticmethod
+  def read_cookies(file_dir: str
+                   ) -> Optional[requests.cookies.RequestsCookieJar]:
+    """Reads cookies saved with `save_cookies`.
+
+    Args:
+      file_dir: Path of the `json` file that contains the cookies.
+
+    Returns:
+      A cookie jar with the saved cookies or ``None`` if the file does not
+      exist or cannot be read.
+    """
+    try:
+      with open(file_dir, "r") as file:
+        cookies = json.load(file)
+    except (OSError, ValueError):
+      return None
+    if not isinstance(cookies, list) or not all(
+        _is_valid_cookie(cookie) for cookie in cookies):
+      return None
+    jar = requests.cookies.RequestsCookieJar()
+    for cookie in cookies:
+      jar.set_cookie(requests.cookies.create_cookie(**cookie))
+    return jar
+
+  def load_cookies(self, file_dir: str) -> bool:
+    """Loads cookies saved with `save_cookies` if they are still logged in.
+
+    The saved cookies are first checked locally, so that no request is sent
+    when they are missing or expired, and then using `check_login`.
+    Cookies that fail either check are not kept in the session.
+
+    Args:
+      file_dir: Path of the `json` file that contains the cookies.
+
+    Returns:
+      ``True`` if the loaded cookies contain a valid login, otherwise
+      ``False``. In the latter case `login` should be called.
+    """
+    cookies = self.read_cookies(file_dir)
+    if cookies is None or not self.has_login_cookies(cookies):
+      return False
+    cookies.clear_expired_cookies()
+    self.session.cookies.update(cookies)
+    if self.check_login():
+      return True
+    self.session.cookies.clear()
+    return False
+
+  def login_cached(self, email: str, password: str, cookies_file: str) -> bool:
+    """Logs in reusing cookies from `cookies_file` if they are still valid.
+
+    If the saved cookies are missing, unreadable or no longer logged in, a
+    normal `login` is performed and the new cookies are saved to
+    `cookies_file`.
+
+    Returns:
+      ``True`` if the saved cookies were reused, ``False`` if a new login
+      was required.
+
+    Raises:
+      LoginError: If the new login fails. The stale `cookies_file` is
+        removed in this case.
+    """
+    if self.load_cookies(cookies_file):
+      return True
+    try:
+      self.login(email, password)
+    except LoginError:
+      if os.path.exists(cookies_file):
+        os.remove(cookies_file)
+      raise
+    self.save_cookies(cookies_file)
+    return False
 
   def _get(self, url, **kwargs):
     """Implements `get` and `get_large_photo`."""
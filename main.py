@@ -41,7 +41,8 @@ def main(friends_file: str,
          sleep_time: int = 1,
          sleep_between: int = 4,
          start: int = 0,
-         end: Optional[int] = None):
+         end: Optional[int] = None,
+         cookies_file: Optional[str] = None):
   """Runs photo downloader.
 
   Args:
@@ -59,6 +60,10 @@ def main(friends_file: str,
       profile.
     sleep_between: Awaiting time between scrapping the next profile.
     start, end: Optional indexing of the list read in `friends_file`.
+    cookies_file: Optional path of a `json` file to save the session cookies.
+      If it contains a valid login from a previous run, logging in again is
+      skipped. The cookies are saved again at the end of the run to keep
+      the ones that facebook refreshed during the session.
   """
   # Read profile ids from given file
   profile_ids = read_friend_list(friends_file)
@@ -78,10 +83,18 @@ def main(friends_file: str,
 
   # Log in to facebook
   fb_session = downloader.facebook.FacebookSession()
-  fb_session.login(email, password)
-  print("Logged in to facebook using {}.".format(email))
+  if cookies_file is None:
+    reused = False
+    fb_session.login(email, password)
+  else:
+    reused = fb_session.login_cached(email, password, cookies_file)
+  if reused:
+    print("Reused facebook session from {}.".format(cookies_file))
+  else:
+    print("Logged in to facebook using {}.".format(email))
   database.set_session(fb_session, max_photos, sleep_time)
-  time.sleep(sleep_between)
+  if not reused:
+    time.sleep(sleep_between)
 
   # Scrape profiles and add them to database
   for profile_id in profile_ids:
@@ -89,6 +102,8 @@ def main(friends_file: str,
 
   # Save data to pkl
   database.save()
+  if cookies_file is not None:
+    fb_session.save_cookies(cookies_file)
 
 
 if __name__ == "__main__":
@@ -102,4 +117,5 @@ if __name__ == "__main__":
   parser.add_argument("--password", default=None, type=str)
   parser.add_argument("--sleep-time", default=1, type=int)
   parser.add_argument("--sleep-between", default=3, type=int)
+  parser.add_argument("--cookies-file", default=None, type=str)
   main(**vars(parser.parse_args()))
@@ -0,0 +1,152 @@
+"""Tests for saving and loading facebook session cookies."""
+import os
+import stat
+import time
+import pytest
+import requests
+from downloader import facebook
+
+
+class FakeResponse:
+  """Minimal stand-in for `requests.Response`."""
+
+  def __init__(self, status_code=200, location=None):
+    self.status_code = status_code
+    self.headers = {} if location is None else {"Location": location}
+
+
+class FakeSession(requests.Session):
+  """Session that answers requests locally instead of contacting facebook.
+
+  Args:
+    login_ok: Whether posting to login.php sets the login cookies.
+    logged_in: Whether the homepage accepts the login cookies.
+  """
+
+  def __init__(self, login_ok=True, logged_in=True):
+    super().__init__()
+    self.login_ok = login_ok
+    self.logged_in = logged_in
+    self.calls = []
+
+  def get(self, url, **kwargs):
+    self.calls.append(("get", url))
+    if "c_user" in self.cookies and not self.logged_in:
+      return FakeResponse(302, "https://m.facebook.com/login.php")
+    return FakeResponse()
+
+  def post(self, url, **kwargs):
+    self.calls.append(("post", url))
+    self.posted_cookies = dict(self.cookies)
+    if self.login_ok:
+      self.cookies.set("c_user", "1234", domain=".facebook.com")
+      self.cookies.set("xs", "abcd", domain=".facebook.com")
+    return FakeResponse(302, "https://m.facebook.com/home.php")
+
+
+def posted(session):
+  return [url for method, url in session.calls if method == "post"]
+
+
+@pytest.fixture
+def cookies_file(tmp_path):
+  return str(tmp_path / "cookies.json")
+
+
+def test_save_cookies_owner_only(cookies_file):
+  fb_session = facebook.FacebookSession(FakeSession())
+  fb_session.login("email", "pass")
+  fb_session.save_cookies(cookies_file)
+  assert stat.S_IMODE(os.stat(cookies_file).st_mode) == 0o600
+  assert os.listdir(os.path.dirname(cookies_file)) == ["cookies.json"]
+
+
+def test_save_cookies_missing_directory(tmp_path, capsys):
+  fb_session = facebook.FacebookSession(FakeSession())
+  fb_session.login("email", "pass")
+  fb_session.save_cookies(str(tmp_path / "missing" / "cookies.json"))
+  assert "WARNING" in capsys.readouterr().out
+
+
+def test_has_login_cookies_keeps_expired_cookies():
+  session = FakeSession()
+  session.cookies.set("c_user", "1234", expires=time.time() - 10)
+  session.cookies.set("xs", "abcd")
+  assert not facebook.FacebookSession.has_login_cookies(session.cookies)
+  assert len(session.cookies) == 2
+
+
+def test_login_failed():
+  fb_session = facebook.FacebookSession(FakeSession(login_ok=False))
+  with pytest.raises(facebook.LoginError):
+    fb_session.login("email", "pass")
+
+
+def test_login_cached_reuses_saved_cookies(cookies_file):
+  first = facebook.FacebookSession(FakeSession())
+  assert not first.login_cached("email", "pass", cookies_file)
+  assert os.path.exists(cookies_file)
+
+  session = FakeSession()
+  second = facebook.FacebookSession(session)
+  assert second.login_cached("email", "pass", cookies_file)
+  assert not posted(session)
+  assert second.session.cookies.get("c_user") == "1234"
+
+
+@pytest.mark.parametrize("content", [
+    "", "[{\"name\": \"c_", "\x80\x04]", "{\"c_user\": 1}",
+    "[{\"name\": \"c_user\", \"value\": \"1\", \"domain\": 5}]",
+    "[{\"name\": \"c_user\", \"value\": \"1\", \"domain\": \"\", "
+    "\"path\": \"/\", \"expires\": \"never\", \"secure\": false}]"])
+def test_login_cached_corrupt_file(cookies_file, content):
+  with open(cookies_file, "w") as file:
+    file.write(content)
+  session = FakeSession()
+  fb_session = facebook.FacebookSession(session)
+  assert not fb_session.login_cached("email", "pass", cookies_file)
+  assert len(posted(session)) == 1
+  assert fb_session.read_cookies(cookies_file) is not None
+
+
+def test_login_cached_missing_file(cookies_file):
+  session = FakeSession()
+  fb_session = facebook.FacebookSession(session)
+  assert not fb_session.login_cached("email", "pass", cookies_file)
+  assert len(posted(session)) == 1
+
+
+def test_login_cached_expired_cookies(cookies_file):
+  fb_session = facebook.FacebookSession(FakeSession())
+  fb_session.session.cookies.set("c_user", "1234", expires=time.time() - 10)
+  fb_session.session.cookies.set("xs", "abcd", expires=time.time() - 10)
+  fb_session.save_cookies(cookies_file)
+
+  session = FakeSession()
+  fb_session = facebook.FacebookSession(session)
+  assert not fb_session.login_cached("email", "pass", cookies_file)
+  # Expired cookies are rejected without checking them with a request, so
+  # only the requests of `login` are sent.
+  assert session.calls == [("get", fb_session.base_url),
+                           ("post", fb_session.base_url + "/login.php")]
+
+
+def test_login_cached_revoked_cookies(cookies_file):
+  facebook.FacebookSession(FakeSession()).login_cached("email", "pass",
+                                                       cookies_file)
+  session = FakeSession(logged_in=False)
+  fb_session = facebook.FacebookSession(session)
+  assert not fb_session.login_cached("email", "pass", cookies_file)
+  assert len(posted(session)) == 1
+  # The revoked cookies are not sent with the new login.
+  assert "c_user" not in session.posted_cookies
+
+
+def test_login_cached_failed_login_removes_file(cookies_file):
+  facebook.FacebookSession(FakeSession()).login_cached("email", "pass",
+                                                       cookies_file)
+  session = FakeSession(login_ok=False, logged_in=False)
+  fb_session = facebook.FacebookSession(session)
+  with pytest.raises(facebook.LoginError):
+    fb_session.login_cached("email", "pass", cookies_file)
+  assert not os.path.exists(cookies_file)